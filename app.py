@@ -1,11 +1,34 @@
 """
 EMR Cost Optimizer - Flask Application
 """
+import atexit
+import concurrent.futures
+import logging
+import logging.handlers
+import queue
 from flask import Flask, jsonify, render_template, request
 from services.emr_service import EMRService
 from services.analyzer_service import AnalyzerService
 import config
 
+
+def configure_logging():
+    """
+    Send log records through a queue to a background listener thread, so
+    service worker threads never block on writing to the stream.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+
+
+configure_logging()
+
 app = Flask(__name__)
 
 # Initialize services
@@ -47,15 +70,24 @@ def get_clusters():
         include_terminated: Include clusters terminated in last 3 hours (default: true)
     """
     try:
-        # Get running clusters
-        running_clusters = emr_service.list_running_clusters()
-
         # Check if we should include terminated clusters
         include_terminated = request.args.get('include_terminated', 'true').lower() == 'true'
 
         terminated_clusters = []
-        if include_terminated:
-            terminated_clusters = emr_service.list_recently_terminated_clusters(hours=3)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            # The two listings are independent, so fetch terminated clusters
+            # in the background while running clusters are fetched here
+            terminated_future = None
+            if include_terminated:
+                terminated_future = executor.submit(
+                    emr_service.list_recently_terminated_clusters, hours=3
+                )
+
+            # Get running clusters
+            running_clusters = emr_service.list_running_clusters()
+
+            if terminated_future:
+                terminated_clusters = terminated_future.result()
 
         # Segregate running clusters by type
         transient_clusters = [c for c in running_clusters if c['cluster_type'] == 'TRANSIENT']
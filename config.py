@@ -2,6 +2,7 @@
 Configuration settings for EMR Cost Optimizer
 """
 import os
+import numpy as np
 
 # AWS Configuration
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -10,12 +11,43 @@ AWS_PROFILE = os.environ.get('AWS_PROFILE', None)  # Uses default credentials ch
 # Cluster Classification
 # Transient cluster pattern: STRESS-XXXXXX-{S,L,XL}
 TRANSIENT_CLUSTER_PATTERN = r'^STRESS-\d+-(?:S|L|XL)$'
+TRANSIENT_CLUSTER_PREFIX = 'STRESS-'  # Literal prefix of the pattern; names without it skip the regex ('' disables)
 LONG_RUNNING_THRESHOLD_HOURS = 7  # Clusters running longer than this are considered long-running
 
+# EMR API Concurrency
+EMR_FETCH_CONCURRENCY = 16  # Concurrent cluster / instance group lookups
+EMR_MAX_POOL_CONNECTIONS = 50  # HTTP connections per EMR / EC2 client; raised to 4x EMR_FETCH_CONCURRENCY if lower
+# Cluster metadata (name, tags, applications, ...) rarely changes; instance group state is refreshed sooner
+CLUSTER_METADATA_CACHE_TTL_SECONDS = 60
+CLUSTER_STATE_CACHE_TTL_SECONDS = 15
+CLUSTER_TERMINATED_CACHE_TTL_SECONDS = 3600  # Terminated clusters never change
+CLUSTER_CACHE_MAX_ENTRIES = 1024
+# ListClusters has no EndDateTime filter (and no documented ordering). When set, the recently
+# terminated listing only asks for clusters created at most this many days before its window, so
+# older history is skipped server-side, but clusters that ran longer than this are missed
+TERMINATED_CLUSTER_MAX_RUNTIME_DAYS = None
+
+# EC2 DescribeInstances batching
+EC2_DESCRIBE_BATCH_DELAY_SECONDS = 0.3  # How long to coalesce concurrent lookups before calling EC2
+EC2_DESCRIBE_BATCH_MAX_IDS = 500  # Flush early once this many instance IDs are queued
+EC2_DESCRIBE_BATCH_SIZE = 100  # Instance IDs per DescribeInstances call; a flush sends its chunks concurrently
+EC2_DESCRIBE_MAX_WORKERS = 10
+
 # Metrics Configuration
 CLOUDWATCH_PERIOD_SECONDS = 300  # 5-minute resolution
 MAX_LOOKBACK_DAYS = 3  # Maximum lookback for long-running clusters
 TRANSIENT_LOOKBACK_HOURS = 4  # Lookback for transient clusters
+CLOUDWATCH_MAX_QUERIES_PER_REQUEST = 500  # GetMetricData limit on MetricDataQueries per call
+CLOUDWATCH_MAX_WORKERS = 16  # Concurrent GetMetricData requests per aggregation
+CLOUDWATCH_MAX_POOL_CONNECTIONS = 50  # Shared client pool; groups are fetched concurrently too
+METRICS_CACHE_TTL_SECONDS = 300  # Reuse per-instance metrics for identical windows within this time
+METRICS_CACHE_MAX_ENTRIES = 4096
+# Raw series are kept so re-analysis only fetches the newly elapsed slice of the window;
+# if the window end moved by less than this fraction of its length, the cached series is reused as-is
+METRICS_UPDATE_THRESHOLD = 0.1
+METRICS_REFRESH_OVERLAP_SECONDS = 15 * 60  # Re-read this much of the cached tail; CloudWatch publishes datapoints late
+METRICS_SERIES_CACHE_TTL_SECONDS = 24 * 3600
+METRICS_SERIES_CACHE_MAX_ENTRIES = 2048
 
 # Configurable lookback options (in hours) for the UI
 LOOKBACK_OPTIONS = [
@@ -57,6 +89,7 @@ THRESHOLDS = {
 SUSTAINED_PEAK_THRESHOLD_MINUTES = 10  # Peak must be sustained for this long to be used for sizing
 SPIKE_DETECTION_GAP_PERCENT = 15  # If gap between P90 and P95 > this, it's likely a spike
 UTILIZATION_THRESHOLDS = [70, 80, 90]  # Thresholds for duration tracking
+UTILIZATION_THRESHOLDS_ARR = np.array(UTILIZATION_THRESHOLDS, dtype=np.float64)  # For vectorized comparisons
 
 # Headroom buffer for recommendations
 HEADROOM_PERCENT = 20
@@ -1,7 +1,9 @@
 """
 Analyzer Service for utilization analysis and recommendations
 """
+import concurrent.futures
 import json
+import logging
 import os
 from datetime import datetime, timezone, timedelta
 from dateutil import parser as date_parser
@@ -11,6 +13,8 @@ from services.emr_service import EMRService
 from services.cloudwatch_service import CloudWatchService
 from services.pricing_service import PricingService
 
+logger = logging.getLogger(__name__)
+
 
 class AnalyzerService:
     """Service for analyzing cluster utilization and generating recommendations"""
@@ -63,21 +67,29 @@ class AnalyzerService:
         actual_lookback_hours = round((now - start_time).total_seconds() / 3600, 1)
 
         # Analyze each instance group (CORE and TASK only, skip MASTER)
+        # Groups are analyzed concurrently so their CloudWatch fetches overlap
+        groups = [group for group in cluster['instance_groups'] if group['type'] in ['CORE', 'TASK']]
         node_analyses = {}
         total_potential_savings = 0
 
-        for group in cluster['instance_groups']:
-            if group['type'] in ['CORE', 'TASK']:
-                analysis = self._analyze_instance_group(
-                    group,
-                    start_time,
-                    cluster['cluster_type']
-                )
-                node_analyses[group['type']] = analysis
-
-                if analysis.get('recommendations') and analysis['recommendations'].get('best_recommendation'):
-                    savings = analysis['recommendations']['best_recommendation'].get('savings', {})
-                    total_potential_savings += savings.get('hourly_savings', 0)
+        analyses = []
+        if groups:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                analyses = list(executor.map(
+                    lambda group: self._analyze_instance_group(
+                        group,
+                        start_time,
+                        cluster['cluster_type']
+                    ),
+                    groups
+                ))
+
+        for group, analysis in zip(groups, analyses):
+            node_analyses[group['type']] = analysis
+
+            if analysis.get('recommendations') and analysis['recommendations'].get('best_recommendation'):
+                savings = analysis['recommendations']['best_recommendation'].get('savings', {})
+                total_potential_savings += savings.get('hourly_savings', 0)
 
         # Build analysis result
         result = {
@@ -567,8 +579,8 @@ class AnalyzerService:
             # Save
             with open(config.ANALYSIS_HISTORY_FILE, 'w') as f:
                 json.dump(history, f, indent=2, default=str)
-        except Exception as e:
-            print(f"Error saving analysis: {e}")
+        except Exception:
+            logger.exception("Error saving analysis for %s", analysis.get('cluster_id'))
 
     def _load_analysis_history(self) -> Dict:
         """Load analysis history from JSON file"""
@@ -576,8 +588,8 @@ class AnalyzerService:
             if os.path.exists(config.ANALYSIS_HISTORY_FILE):
                 with open(config.ANALYSIS_HISTORY_FILE, 'r') as f:
                     return json.load(f)
-        except Exception as e:
-            print(f"Error loading analysis history: {e}")
+        except Exception:
+            logger.exception("Error loading analysis history")
         return {}
 
     def get_analysis_history(self, cluster_id: str = None) -> Dict:
@@ -0,0 +1,32 @@
+"""
+Shared AWS session for the AWS-backed services
+"""
+import functools
+import logging
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+import config
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_session() -> boto3.Session:
+    """
+    Return the process-wide boto3 session, creating it on first use.
+    Credentials are resolved here once, so the first API call doesn't pay for
+    the provider chain lookup (profile, SSO cache, instance metadata). A failure
+    here (e.g. an expired SSO token or a denied role) is only logged; the API calls report it.
+    """
+    session_kwargs = {'region_name': config.AWS_REGION}
+    if config.AWS_PROFILE:
+        session_kwargs['profile_name'] = config.AWS_PROFILE
+
+    session = boto3.Session(**session_kwargs)
+    try:
+        credentials = session.get_credentials()
+        if credentials is not None:
+            credentials.get_frozen_credentials()
+    except (BotoCoreError, ClientError) as e:
+        logger.warning("Could not pre-load AWS credentials: %s", e)
+    return session
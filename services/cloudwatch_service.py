@@ -1,23 +1,92 @@
 """
 CloudWatch Service for metrics collection
 """
-import boto3
+import concurrent.futures
+import functools
+import logging
+import threading
 import numpy as np
+from numpy.lib import recfunctions
+from botocore.config import Config as BotoConfig
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional
 import config
+from services.aws import get_session
+from services.cache import TTLCache
+
+__all__ = ['CloudWatchService']
+
+logger = logging.getLogger(__name__)
+
+# Below this many datapoints, interpolated percentiles are used since selection error matters
+PARTITION_MIN_DATAPOINTS = 50
+
+# Peak types from most to least conservative, and the percentile each one sizes from
+PEAK_TYPES = ['momentary', 'moderate', 'sustained']
+PEAK_RANK = {peak_type: rank for rank, peak_type in enumerate(PEAK_TYPES)}
+PEAK_PERCENTILE = {'momentary': 'P75', 'moderate': 'P90', 'sustained': 'P95'}
+
+# Struct-of-arrays layout for per-instance metrics: one record per instance, one column per statistic
+METRIC_STAT_FIELDS = ['average', 'p75', 'p90', 'p95', 'p99', 'effective_peak', 'spike_gap']
+METRICS_DTYPE = np.dtype(
+    [('available', '?')]
+    + [(field, 'f8') for field in METRIC_STAT_FIELDS]
+    + [
+        ('duration_at_p95_minutes', 'f8'),
+        ('duration_above', 'f8', (len(config.UTILIZATION_THRESHOLDS),)),
+        ('peak_type', 'U16')
+    ]
+)
+
+_cloudwatch_client = None
+_cloudwatch_client_lock = threading.Lock()
+
+
+def _get_cloudwatch_client():
+    """
+    Return the process-wide CloudWatch client, creating it on first use.
+    botocore clients are thread-safe, so one client is shared by all services and requests.
+    """
+    global _cloudwatch_client
+    if _cloudwatch_client is None:
+        with _cloudwatch_client_lock:
+            if _cloudwatch_client is None:
+                _cloudwatch_client = get_session().client(
+                    'cloudwatch',
+                    config=BotoConfig(
+                        retries={'mode': 'adaptive', 'max_attempts': 10},
+                        connect_timeout=5,
+                        read_timeout=30,
+                        max_pool_connections=config.CLOUDWATCH_MAX_POOL_CONNECTIONS
+                    )
+                )
+    return _cloudwatch_client
 
 
 class CloudWatchService:
     """Service for CloudWatch metrics collection"""
 
     def __init__(self):
-        session_kwargs = {'region_name': config.AWS_REGION}
-        if config.AWS_PROFILE:
-            session_kwargs['profile_name'] = config.AWS_PROFILE
-
-        self.session = boto3.Session(**session_kwargs)
-        self.cloudwatch_client = self.session.client('cloudwatch')
+        # Per-instance metrics keyed by (instance_id, aligned start, aligned end)
+        self._metrics_cache = TTLCache(
+            maxsize=config.METRICS_CACHE_MAX_ENTRIES,
+            ttl=config.METRICS_CACHE_TTL_SECONDS
+        )
+        # Raw series per (instance_id, 'cpu' | 'mem') with the window they cover, for incremental refresh
+        self._series_cache = TTLCache(
+            maxsize=config.METRICS_SERIES_CACHE_MAX_ENTRIES,
+            ttl=config.METRICS_SERIES_CACHE_TTL_SECONDS
+        )
+        # Instances whose last memory query came back empty (no CloudWatch agent)
+        self._no_memory_metrics = TTLCache(
+            maxsize=config.METRICS_CACHE_MAX_ENTRIES,
+            ttl=config.METRICS_CACHE_TTL_SECONDS
+        )
+
+    @functools.cached_property
+    def cloudwatch_client(self):
+        """CloudWatch client, built lazily on first API call"""
+        return _get_cloudwatch_client()
 
     def get_instance_metrics(
         self,
@@ -38,10 +107,19 @@ class CloudWatchService:
         if end_time.tzinfo is None:
             end_time = end_time.replace(tzinfo=timezone.utc)
 
+        # Snap to period boundaries so near-identical windows share cache entries and queries
+        start_time = self._align_to_period(start_time)
+        end_time = self._align_to_period(end_time)
+
+        cache_key = self._cache_key(instance_id, start_time, end_time)
+        cached = self._metrics_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         cpu_metrics = self._get_cpu_metrics(instance_id, start_time, end_time)
         memory_metrics = self._get_memory_metrics(instance_id, start_time, end_time)
 
-        return {
+        metrics = {
             'instance_id': instance_id,
             'start_time': start_time.isoformat(),
             'end_time': end_time.isoformat(),
@@ -49,6 +127,19 @@ class CloudWatchService:
             'memory': memory_metrics,
             'metrics_available': cpu_metrics['datapoints'] > 0 or memory_metrics['datapoints'] > 0
         }
+        if metrics['metrics_available']:
+            self._metrics_cache.set(cache_key, metrics)
+
+        return metrics
+
+    def _align_to_period(self, timestamp: datetime) -> datetime:
+        """Round a timestamp down to a CLOUDWATCH_PERIOD_SECONDS boundary (UTC)"""
+        period = config.CLOUDWATCH_PERIOD_SECONDS
+        return datetime.fromtimestamp((int(timestamp.timestamp()) // period) * period, tz=timezone.utc)
+
+    def _cache_key(self, instance_id: str, start_time: datetime, end_time: datetime) -> tuple:
+        """Build a metrics cache key from a period-aligned window"""
+        return (instance_id, start_time.isoformat(), end_time.isoformat())
 
     def _get_cpu_metrics(
         self,
@@ -57,23 +148,10 @@ class CloudWatchService:
         end_time: datetime
     ) -> Dict:
         """Get CPU utilization metrics from AWS/EC2 namespace"""
-        try:
-            response = self.cloudwatch_client.get_metric_statistics(
-                Namespace=config.EC2_NAMESPACE,
-                MetricName=config.CPU_METRIC_NAME,
-                Dimensions=[
-                    {'Name': 'InstanceId', 'Value': instance_id}
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=config.CLOUDWATCH_PERIOD_SECONDS,
-                Statistics=['Average', 'Maximum', 'Minimum']
-            )
-
-            return self._process_metric_datapoints(response['Datapoints'], 'Average')
-        except Exception as e:
-            print(f"Error getting CPU metrics for {instance_id}: {e}")
-            return self._empty_metrics()
+        datapoints = self._get_metric_datapoints(
+            instance_id, start_time, end_time, config.EC2_NAMESPACE, config.CPU_METRIC_NAME
+        )
+        return self._process_metric_datapoints(datapoints or [], 'Average')
 
     def _get_memory_metrics(
         self,
@@ -82,55 +160,269 @@ class CloudWatchService:
         end_time: datetime
     ) -> Dict:
         """Get Memory utilization metrics from CWAgent namespace"""
+        if self._no_memory_metrics.get(instance_id):
+            return self._empty_metrics()
+
+        datapoints = self._get_metric_datapoints(
+            instance_id, start_time, end_time, config.CWAGENT_NAMESPACE, config.MEMORY_METRIC_NAME
+        )
+        if datapoints == []:
+            self._no_memory_metrics.set(instance_id, True)
+        return self._process_metric_datapoints(datapoints or [], 'Average')
+
+    def _get_metric_datapoints(
+        self,
+        instance_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        namespace: str,
+        metric_name: str
+    ) -> Optional[List[Dict]]:
+        """Get Average datapoints for one instance metric, or None if the call failed"""
         try:
             response = self.cloudwatch_client.get_metric_statistics(
-                Namespace=config.CWAGENT_NAMESPACE,
-                MetricName=config.MEMORY_METRIC_NAME,
+                Namespace=namespace,
+                MetricName=metric_name,
                 Dimensions=[
                     {'Name': 'InstanceId', 'Value': instance_id}
                 ],
                 StartTime=start_time,
                 EndTime=end_time,
                 Period=config.CLOUDWATCH_PERIOD_SECONDS,
-                Statistics=['Average', 'Maximum', 'Minimum']
+                Statistics=['Average']
             )
 
-            return self._process_metric_datapoints(response['Datapoints'], 'Average')
+            return response['Datapoints']
         except Exception as e:
-            print(f"Error getting Memory metrics for {instance_id}: {e}")
-            return self._empty_metrics()
+            logger.warning("Error getting %s metrics for %s: %s", metric_name, instance_id, e)
+            return None
+
+    def get_metrics_for_instances_batch(
+        self,
+        instance_ids: List[str],
+        start_time: datetime,
+        end_time: datetime = None
+    ) -> Dict[str, Dict]:
+        """
+        Get CPU and Memory metrics for many EC2 instances using batched GetMetricData.
+        Returns a dict of instance_id -> metrics, same shape as get_instance_metrics.
+        """
+        if end_time is None:
+            end_time = datetime.now(timezone.utc)
+
+        # Ensure timezone awareness
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        if end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=timezone.utc)
+
+        # Snap to period boundaries so near-identical windows share cache entries and queries
+        start_time = self._align_to_period(start_time)
+        end_time = self._align_to_period(end_time)
+
+        results = {}
+        for instance_id in instance_ids:
+            cached = self._metrics_cache.get(self._cache_key(instance_id, start_time, end_time))
+            if cached is not None:
+                results[instance_id] = cached
+        missing_ids = list(dict.fromkeys(iid for iid in instance_ids if iid not in results))
+
+        if not missing_ids:
+            return results
+
+        metric_sources = [
+            ('cpu', config.EC2_NAMESPACE, config.CPU_METRIC_NAME),
+            ('mem', config.CWAGENT_NAMESPACE, config.MEMORY_METRIC_NAME)
+        ]
+
+        # Plan one query per (instance, metric). Series cached from an earlier run are reused
+        # as-is when the window end barely moved, or extended by fetching only the new slice.
+        window_seconds = (end_time - start_time).total_seconds()
+        series = {}
+        pending = {}
+        queries_by_start = {}
+        for i, instance_id in enumerate(missing_ids):
+            for prefix, namespace, metric_name in metric_sources:
+                # Instances whose memory query recently came back empty don't run the CloudWatch agent
+                if prefix == 'mem' and self._no_memory_metrics.get(instance_id):
+                    continue
+
+                query_id = f"{prefix}_{i}"
+                cached = self._series_cache.get((instance_id, prefix))
+                fetch_start = start_time
+                if cached and cached['start'] <= start_time < cached['end'] <= end_time:
+                    elapsed_seconds = (end_time - cached['end']).total_seconds()
+                    if elapsed_seconds <= window_seconds * config.METRICS_UPDATE_THRESHOLD:
+                        series[query_id] = self._slice_series(cached, start_time, end_time)
+                        continue
+                    # Re-read the cached tail too: its last periods may have been partial, and
+                    # late datapoints can still arrive for periods several minutes old
+                    fetch_start = max(
+                        start_time, cached['end'] - timedelta(seconds=config.METRICS_REFRESH_OVERLAP_SECONDS)
+                    )
+
+                pending[query_id] = (instance_id, prefix, cached, fetch_start)
+                queries_by_start.setdefault(fetch_start, []).append({
+                    'Id': query_id,
+                    'MetricStat': {
+                        'Metric': {
+                            'Namespace': namespace,
+                            'MetricName': metric_name,
+                            'Dimensions': [
+                                {'Name': 'InstanceId', 'Value': instance_id}
+                            ]
+                        },
+                        'Period': config.CLOUDWATCH_PERIOD_SECONDS,
+                        # Only Average is consumed; max/min are derived from the averaged series
+                        'Stat': 'Average'
+                    },
+                    'ReturnData': True
+                })
+
+        # GetMetricData takes one time range per request, so chunk queries per fetch start
+        # and run all request chunks concurrently
+        chunk_size = config.CLOUDWATCH_MAX_QUERIES_PER_REQUEST
+        chunks = [
+            (fetch_start, queries[i:i + chunk_size])
+            for fetch_start, queries in queries_by_start.items()
+            for i in range(0, len(queries), chunk_size)
+        ]
+        failed_indexes = set()
+        if chunks:
+            max_workers = min(config.CLOUDWATCH_MAX_WORKERS, len(chunks))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for (fetch_start, chunk), chunk_series in zip(chunks, executor.map(
+                    lambda request: self._fetch_metric_data(request[1], request[0], end_time), chunks
+                )):
+                    for query in chunk:
+                        query_id = query['Id']
+                        instance_id, prefix, cached, _ = pending[query_id]
+                        if chunk_series is None:
+                            failed_indexes.add(int(query_id.rsplit('_', 1)[1]))
+                            continue
+
+                        timestamps, values = chunk_series.get(query_id, self._empty_series())
+                        if prefix == 'mem' and fetch_start == start_time and not len(values):
+                            self._no_memory_metrics.set(instance_id, True)
+                        if fetch_start > start_time:
+                            # Prepend the cached part of the window that was not re-fetched
+                            older_timestamps, older_values = self._slice_series(cached, start_time, fetch_start)
+                            timestamps = np.concatenate([older_timestamps, timestamps])
+                            values = np.concatenate([older_values, values])
+
+                        self._series_cache.set((instance_id, prefix), {
+                            'start': start_time,
+                            'end': end_time,
+                            'timestamps': timestamps,
+                            'values': values
+                        })
+                        series[query_id] = (timestamps, values)
+
+        for i, instance_id in enumerate(missing_ids):
+            cpu_metrics = self._process_metric_values(series.get(f"cpu_{i}", self._empty_series())[1])
+            memory_metrics = self._process_metric_values(series.get(f"mem_{i}", self._empty_series())[1])
+
+            metrics = {
+                'instance_id': instance_id,
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'cpu': cpu_metrics,
+                'memory': memory_metrics,
+                'metrics_available': cpu_metrics['datapoints'] > 0 or memory_metrics['datapoints'] > 0
+            }
+            # Empty or failed results are not cached so they are retried on the next run
+            if metrics['metrics_available'] and i not in failed_indexes:
+                self._metrics_cache.set(self._cache_key(instance_id, start_time, end_time), metrics)
+            results[instance_id] = metrics
+
+        return results
+
+    def _empty_series(self) -> tuple:
+        """Return an empty (epoch seconds, values) series"""
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    def _slice_series(self, cached: Dict, start_time: datetime, end_time: datetime) -> tuple:
+        """Return the part of a cached series with start_time <= timestamp < end_time"""
+        timestamps = cached['timestamps']
+        lo, hi = np.searchsorted(timestamps, [start_time.timestamp(), end_time.timestamp()])
+        return timestamps[lo:hi], cached['values'][lo:hi]
+
+    def _fetch_metric_data(
+        self,
+        queries: List[Dict],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[Dict]:
+        """
+        Run one GetMetricData request, following NextToken pagination.
+        Returns query Id -> (epoch seconds, values) arrays, or None if the request failed.
+        """
+        series = {}
+        try:
+            request_kwargs = {
+                'MetricDataQueries': queries,
+                'StartTime': start_time,
+                'EndTime': end_time,
+                'ScanBy': 'TimestampAscending'
+            }
+            while True:
+                response = self.cloudwatch_client.get_metric_data(**request_kwargs)
+                for result in response['MetricDataResults']:
+                    timestamps, values = series.setdefault(result['Id'], ([], []))
+                    timestamps.extend(result['Timestamps'])
+                    values.extend(result['Values'])
+
+                next_token = response.get('NextToken')
+                if not next_token:
+                    break
+                request_kwargs['NextToken'] = next_token
+        except Exception as e:
+            logger.warning("Error getting batched metrics for %d queries: %s", len(queries), e)
+            return None
+
+        return {
+            query_id: (
+                np.fromiter((int(t.timestamp()) for t in timestamps), dtype=np.int64, count=len(timestamps)),
+                np.asarray(values, dtype=np.float64)
+            )
+            for query_id, (timestamps, values) in series.items()
+        }
 
     def _process_metric_datapoints(self, datapoints: List[Dict], avg_stat: str) -> Dict:
         """Process CloudWatch datapoints and calculate statistics with sustained peak analysis"""
         if not datapoints:
             return self._empty_metrics()
 
-        # Extract values
-        averages = [dp[avg_stat] for dp in datapoints if avg_stat in dp]
-        maximums = [dp['Maximum'] for dp in datapoints if 'Maximum' in dp]
-        minimums = [dp['Minimum'] for dp in datapoints if 'Minimum' in dp]
+        # Extract values into a preallocated buffer; every datapoint carries the requested statistic
+        averages = np.fromiter(
+            (dp[avg_stat] for dp in datapoints), dtype=np.float64, count=len(datapoints)
+        )
+
+        return self._process_metric_values(averages)
 
-        if not averages:
+    def _process_metric_values(self, averages: np.ndarray) -> Dict:
+        """Calculate statistics with sustained peak analysis from a series of period averages"""
+        if not averages.size:
             return self._empty_metrics()
 
         # Calculate basic statistics
-        avg_value = np.mean(averages)
-        max_value = max(maximums) if maximums else max(averages)
-        min_value = min(minimums) if minimums else min(averages)
+        avg_value = averages.mean()
+        max_value = averages.max()
+        min_value = averages.min()
 
         # Calculate multiple percentiles for sustained peak analysis
-        p75_value = np.percentile(averages, 75)
-        p90_value = np.percentile(averages, 90)
-        p95_value = np.percentile(averages, 95)
-        p99_value = np.percentile(averages, 99)
+        p75_value, p90_value, p95_value, p99_value = self._calculate_percentiles(
+            averages, [75, 90, 95, 99]
+        )
 
         # Calculate duration above thresholds (in minutes)
         # Each datapoint represents CLOUDWATCH_PERIOD_SECONDS
         period_minutes = config.CLOUDWATCH_PERIOD_SECONDS / 60
-        duration_above = {}
-        for threshold in config.UTILIZATION_THRESHOLDS:
-            count_above = sum(1 for v in averages if v >= threshold)
-            duration_above[threshold] = round(count_above * period_minutes, 1)
+        counts_above = (averages[:, None] >= config.UTILIZATION_THRESHOLDS_ARR[None, :]).sum(axis=0)
+        duration_above = dict(zip(
+            config.UTILIZATION_THRESHOLDS,
+            np.round(counts_above * period_minutes, 1).tolist()
+        ))
 
         # Detect if P95 is a spike (large gap between P90 and P95)
         spike_gap = p95_value - p90_value
@@ -140,7 +432,7 @@ class CloudWatchService:
         # Check if P95 was sustained for at least the threshold duration
         sustained_threshold = config.SUSTAINED_PEAK_THRESHOLD_MINUTES
         p95_threshold = p95_value * 0.95  # Consider values within 5% of P95 as "at P95 level"
-        count_at_p95_level = sum(1 for v in averages if v >= p95_threshold)
+        count_at_p95_level = int(np.count_nonzero(averages >= p95_threshold))
         duration_at_p95_level = count_at_p95_level * period_minutes
 
         # Select effective peak for sizing
@@ -159,26 +451,47 @@ class CloudWatchService:
             peak_type = 'momentary'
             effective_peak_percentile = 'P75'
 
+        # Round all reported values in one vectorized call (also yields native floats for JSON)
+        (
+            avg_value, p75_value, p90_value, p95_value, p99_value,
+            max_value, min_value, effective_peak, spike_gap
+        ) = np.round(np.array([
+            avg_value, p75_value, p90_value, p95_value, p99_value,
+            max_value, min_value, effective_peak, spike_gap
+        ]), 2).tolist()
+
         return {
-            'average': round(avg_value, 2),
-            'p75': round(p75_value, 2),
-            'p90': round(p90_value, 2),
-            'p95': round(p95_value, 2),
-            'p99': round(p99_value, 2),
-            'max': round(max_value, 2),
-            'min': round(min_value, 2),
-            'datapoints': len(averages),
+            'average': avg_value,
+            'p75': p75_value,
+            'p90': p90_value,
+            'p95': p95_value,
+            'p99': p99_value,
+            'max': max_value,
+            'min': min_value,
+            'datapoints': int(averages.size),
             'available': True,
             # Sustained peak analysis
-            'effective_peak': round(effective_peak, 2),
+            'effective_peak': effective_peak,
             'effective_peak_percentile': effective_peak_percentile,
             'peak_type': peak_type,
             'is_spike': is_spike,
-            'spike_gap': round(spike_gap, 2),
+            'spike_gap': spike_gap,
             'duration_above': duration_above,
             'duration_at_p95_minutes': round(duration_at_p95_level, 1)
         }
 
+    def _calculate_percentiles(self, values: np.ndarray, percentiles: List[float]) -> np.ndarray:
+        """
+        Calculate percentiles of a 1-D array.
+        Large series use O(N) selection via np.partition, equivalent to
+        np.percentile(..., method='lower'); short series interpolate linearly.
+        """
+        if values.size < PARTITION_MIN_DATAPOINTS:
+            return np.percentile(values, percentiles)
+
+        positions = (np.asarray(percentiles, dtype=np.float64) / 100 * (values.size - 1)).astype(np.intp)
+        return np.partition(values, positions)[positions]
+
     def _empty_metrics(self) -> Dict:
         """Return empty metrics structure"""
         return {
@@ -220,27 +533,27 @@ class CloudWatchService:
                 'per_instance': []
             }
 
-        all_cpu_metrics = []
-        all_memory_metrics = []
+        cpu_metrics = np.zeros(len(instance_ids), dtype=METRICS_DTYPE)
+        memory_metrics = np.zeros(len(instance_ids), dtype=METRICS_DTYPE)
         per_instance_metrics = []
         instances_with_metrics = 0
 
-        for instance_id in instance_ids:
-            metrics = self.get_instance_metrics(instance_id, start_time, end_time)
+        # Fetch all instances with batched GetMetricData calls instead of 2 calls per instance
+        batch_metrics = self.get_metrics_for_instances_batch(instance_ids, start_time, end_time)
+
+        for index, instance_id in enumerate(instance_ids):
+            metrics = batch_metrics[instance_id]
             per_instance_metrics.append(metrics)
 
             if metrics['metrics_available']:
                 instances_with_metrics += 1
 
-                if metrics['cpu']['available']:
-                    all_cpu_metrics.append(metrics['cpu'])
-
-                if metrics['memory']['available']:
-                    all_memory_metrics.append(metrics['memory'])
+            cpu_metrics[index] = self._to_metrics_record(metrics['cpu'])
+            memory_metrics[index] = self._to_metrics_record(metrics['memory'])
 
         # Calculate aggregated metrics with sustained peak analysis
-        aggregated_cpu = self._aggregate_values(all_cpu_metrics)
-        aggregated_memory = self._aggregate_values(all_memory_metrics)
+        aggregated_cpu = self._aggregate_values(cpu_metrics)
+        aggregated_memory = self._aggregate_values(memory_metrics)
 
         return {
             'instance_count': len(instance_ids),
@@ -250,65 +563,71 @@ class CloudWatchService:
             'per_instance': per_instance_metrics
         }
 
+    def _to_metrics_record(self, metrics: Dict) -> tuple:
+        """Convert a metrics dict into a METRICS_DTYPE record (None becomes NaN)"""
+        duration_above = metrics.get('duration_above', {})
+        return (
+            (metrics['available'],)
+            + tuple(np.nan if metrics.get(field) is None else metrics[field] for field in METRIC_STAT_FIELDS)
+            + (
+                metrics.get('duration_at_p95_minutes', 0),
+                [duration_above.get(threshold, 0) for threshold in config.UTILIZATION_THRESHOLDS],
+                metrics.get('peak_type') or ''
+            )
+        )
+
     def _aggregate_values(
         self,
-        instance_metrics: List[Dict]
+        instance_metrics: np.ndarray
     ) -> Dict:
-        """Aggregate values across multiple instances with sustained peak analysis"""
-        if not instance_metrics:
+        """
+        Aggregate values across multiple instances with sustained peak analysis.
+        instance_metrics is a METRICS_DTYPE array; only available records are aggregated.
+        """
+        instance_metrics = instance_metrics[instance_metrics['available']]
+        if not instance_metrics.size:
             return self._empty_metrics()
 
-        # Extract values from instance metrics
-        averages = [m['average'] for m in instance_metrics if m.get('average') is not None]
-        p75_values = [m['p75'] for m in instance_metrics if m.get('p75') is not None]
-        p90_values = [m['p90'] for m in instance_metrics if m.get('p90') is not None]
-        p95_values = [m['p95'] for m in instance_metrics if m.get('p95') is not None]
-        p99_values = [m['p99'] for m in instance_metrics if m.get('p99') is not None]
-        effective_peaks = [m['effective_peak'] for m in instance_metrics if m.get('effective_peak') is not None]
+        # View the statistic columns as one 2-D array and reduce along axis 0
+        values = recfunctions.structured_to_unstructured(instance_metrics[METRIC_STAT_FIELDS])
+        present = ~np.isnan(values)
+        counts = present.sum(axis=0)
 
-        if not averages:
+        if not counts[0]:
             return self._empty_metrics()
 
+        means = np.where(present, values, 0).sum(axis=0) / np.maximum(counts, 1)
+        averages = values[present[:, 0], 0]
+
         # Calculate aggregated basic stats (convert to native Python floats for JSON serialization)
-        avg_value = float(np.mean(averages))
-        p75_value = float(np.mean(p75_values) if p75_values else np.percentile(averages, 75))
-        p90_value = float(np.mean(p90_values) if p90_values else np.percentile(averages, 90))
-        p95_value = float(np.mean(p95_values) if p95_values else np.percentile(averages, 95))
-        p99_value = float(np.mean(p99_values) if p99_values else np.percentile(averages, 99))
-        effective_peak = float(np.mean(effective_peaks) if effective_peaks else p95_value)
-
-        # Aggregate duration above thresholds
-        duration_above = {}
-        for threshold in config.UTILIZATION_THRESHOLDS:
-            durations = [m.get('duration_above', {}).get(threshold, 0) for m in instance_metrics]
-            if durations:
-                duration_above[threshold] = round(float(np.mean(durations)), 1)
-
-        # Aggregate duration at P95
-        duration_at_p95_list = [m.get('duration_at_p95_minutes', 0) for m in instance_metrics]
-        duration_at_p95_avg = float(np.mean(duration_at_p95_list)) if duration_at_p95_list else 0
+        # Percentiles fall back to the spread of instance averages when no instance reported them
+        avg_value = float(means[0])
+        p75_value, p90_value, p95_value, p99_value = np.where(
+            counts[1:5] > 0, means[1:5], np.percentile(averages, [75, 90, 95, 99])
+        ).tolist()
+        effective_peak = float(means[5]) if counts[5] else p95_value
+
+        # Aggregate duration above thresholds and duration at P95
+        duration_above = {
+            threshold: round(float(duration), 1)
+            for threshold, duration in zip(
+                config.UTILIZATION_THRESHOLDS, instance_metrics['duration_above'].mean(axis=0)
+            )
+        }
+        duration_at_p95_avg = float(instance_metrics['duration_at_p95_minutes'].mean())
 
         # Determine aggregate spike detection
-        spike_gaps = [m.get('spike_gap', 0) for m in instance_metrics if m.get('spike_gap') is not None]
-        avg_spike_gap = float(np.mean(spike_gaps)) if spike_gaps else 0
+        avg_spike_gap = float(means[6]) if counts[6] else 0
         is_spike = bool(avg_spike_gap > config.SPIKE_DETECTION_GAP_PERCENT)
 
-        # Determine aggregate peak type based on most common type
-        peak_types = [m.get('peak_type') for m in instance_metrics if m.get('peak_type')]
-        if peak_types:
-            # Use the most conservative (worst case) peak type
-            if 'momentary' in peak_types:
-                peak_type = 'momentary'
-                effective_peak_percentile = 'P75'
-            elif 'moderate' in peak_types:
-                peak_type = 'moderate'
-                effective_peak_percentile = 'P90'
-            else:
-                peak_type = 'sustained'
-                effective_peak_percentile = 'P95'
-        else:
-            peak_type = 'sustained'
-            effective_peak_percentile = 'P95'
+        # Use the most conservative (worst case) peak type across instances
+        worst_rank = min(
+            (PEAK_RANK.get(peak_type, PEAK_RANK['sustained'])
+             for peak_type in instance_metrics['peak_type'].tolist() if peak_type),
+            default=PEAK_RANK['sustained']
+        )
+        peak_type = PEAK_TYPES[worst_rank]
+        effective_peak_percentile = PEAK_PERCENTILE[peak_type]
 
         return {
             'average': round(avg_value, 2),
@@ -316,9 +635,9 @@ class CloudWatchService:
             'p90': round(p90_value, 2),
             'p95': round(p95_value, 2),
             'p99': round(p99_value, 2),
-            'max': round(max(averages), 2),
-            'min': round(min(averages), 2),
-            'datapoints': len(averages),
+            'max': round(float(averages.max()), 2),
+            'min': round(float(averages.min()), 2),
+            'datapoints': int(averages.size),
             'available': True,
             # Sustained peak analysis
             'effective_peak': round(effective_peak, 2),
@@ -2,40 +2,247 @@
 EMR Service for cluster operations
 Supports both Instance Groups and Instance Fleets configurations
 """
+import concurrent.futures
+import logging
 import re
-import boto3
+import threading
+from collections import Counter, defaultdict, namedtuple
+from itertools import chain, islice
+from operator import itemgetter
+from botocore.config import Config as BotoConfig
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional
 import config
+from services.aws import get_session
+from services.cache import TTLCache
+
+__all__ = ['EMRService', 'EC2DescribeInstancesBatcher']
+
+logger = logging.getLogger(__name__)
+
+# Compile transient cluster pattern once at import
+_TRANSIENT_RE = re.compile(config.TRANSIENT_CLUSTER_PATTERN)
+
+# In-flight _get_cluster_details lookups keyed by (cluster_id, include_instance_ids)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Process-wide EMR / EC2 clients, created on first use by _get_clients()
+_Clients = namedtuple('_Clients', ['emr', 'ec2'])
+_clients = None
+_clients_lock = threading.Lock()
+
+# DescribeInstances accepts at most this many InstanceIds per call
+DESCRIBE_INSTANCES_MAX_IDS = 1000
+
+# Field getters for the API response records we project
+_APP_NAME = itemgetter('Name')
+_TAG_ITEM = itemgetter('Key', 'Value')
+_GROUP_FIELDS = itemgetter('Id', 'InstanceGroupType', 'InstanceType')
+
+
+class EC2DescribeInstancesBatcher:
+    """
+    Coalesces concurrent DescribeInstances lookups into shared API calls.
+
+    Callers submit instance IDs and get a Future. Requests arriving within
+    max_delay seconds of each other are merged and sent together (or sooner,
+    on a background thread, once max_batch_size IDs are queued); each Future
+    then receives the instances it asked for. A flush is split into
+    chunk_size-ID DescribeInstances calls that run concurrently.
+    """
+
+    def __init__(self, ec2_client, max_delay: float, max_batch_size: int, chunk_size: int, max_workers: int):
+        self.ec2_client = ec2_client
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.chunk_size = min(chunk_size, DESCRIBE_INSTANCES_MAX_IDS)
+        self.max_workers = max_workers
+        self._pending = []  # (instance_ids, future)
+        self._pending_count = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def submit(self, instance_ids: List[str]) -> concurrent.futures.Future:
+        """Queue instance IDs for the next batch; the Future resolves to their instances"""
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._pending.append((instance_ids, future))
+            self._pending_count += len(instance_ids)
+            flush_now = self._pending_count >= self.max_batch_size
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            # Flush off the caller's thread so a caller submitting several chunks isn't serialized
+            threading.Thread(target=self.flush, daemon=True).start()
+        return future
+
+    def flush(self):
+        """Send every queued request now"""
+        with self._lock:
+            pending, self._pending, self._pending_count = self._pending, [], 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pending:
+            return
+
+        # Preserve first-seen order while dropping IDs requested by several callers
+        all_ids = list(dict.fromkeys(
+            instance_id for instance_ids, _ in pending for instance_id in instance_ids
+        ))
+        try:
+            instances_by_id = self._describe(all_ids)
+        except Exception as e:
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+                return
+            # A single bad ID fails the whole call, so retry each caller on its own
+            for instance_ids, future in pending:
+                self._resolve(future, instance_ids)
+            return
+
+        for instance_ids, future in pending:
+            future.set_result(self._select(instances_by_id, instance_ids))
+
+    def _resolve(self, future: concurrent.futures.Future, instance_ids: List[str]):
+        """Describe one caller's instances and settle its Future"""
+        try:
+            instances_by_id = self._describe(instance_ids)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(self._select(instances_by_id, instance_ids))
+
+    def _describe(self, instance_ids: List[str]) -> Dict[str, Dict]:
+        """Describe instances in concurrent chunk_size calls and index them by instance ID"""
+        chunks = [
+            instance_ids[start:start + self.chunk_size]
+            for start in range(0, len(instance_ids), self.chunk_size)
+        ]
+        describe = lambda chunk: self.ec2_client.describe_instances(InstanceIds=chunk)
+        if len(chunks) == 1:
+            responses = [describe(chunks[0])]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                responses = list(executor.map(describe, chunks))
+
+        instances_by_id = {}
+        for response in responses:
+            for reservation in response['Reservations']:
+                for instance in reservation['Instances']:
+                    instances_by_id[instance['InstanceId']] = instance
+        return instances_by_id
+
+    @staticmethod
+    def _select(instances_by_id: Dict[str, Dict], instance_ids: List[str]) -> List[Dict]:
+        return [instances_by_id[instance_id] for instance_id in instance_ids if instance_id in instances_by_id]
+
+
+def _get_clients() -> _Clients:
+    """
+    Return the process-wide EMR and EC2 clients, creating them on first use.
+    botocore clients are thread-safe, so every EMRService and its worker threads share them.
+    """
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                # Enough pooled connections for concurrent lookups: each fetch thread overlaps the
+                # group/fleet listing with list_instances, and the running and terminated listings
+                # run side by side, so up to four per fetch thread; adaptive retries back off
+                # client-side when EMR throttles instead of every thread retrying in lockstep.
+                client_config = BotoConfig(
+                    retries={'mode': 'adaptive', 'max_attempts': 10},
+                    connect_timeout=5,
+                    read_timeout=30,
+                    tcp_keepalive=True,
+                    max_pool_connections=max(
+                        config.EMR_MAX_POOL_CONNECTIONS, config.EMR_FETCH_CONCURRENCY * 4
+                    )
+                )
+                session = get_session()
+                _clients = _Clients(
+                    emr=session.client('emr', config=client_config),
+                    ec2=session.client('ec2', config=client_config)
+                )
+    return _clients
 
 
 class EMRService:
     """Service for EMR cluster operations"""
 
-    def __init__(self):
-        session_kwargs = {'region_name': config.AWS_REGION}
-        if config.AWS_PROFILE:
-            session_kwargs['profile_name'] = config.AWS_PROFILE
-
-        self.session = boto3.Session(**session_kwargs)
-        self.emr_client = self.session.client('emr')
-        self.ec2_client = self.session.client('ec2')
+    __slots__ = ('session', 'emr_client', 'ec2_client', 'ec2_batcher', '_cluster_cache', '_instance_cache')
 
-        # Compile transient cluster pattern
-        self.transient_pattern = re.compile(config.TRANSIENT_CLUSTER_PATTERN)
+    def __init__(self):
+        self.session = get_session()
+        self.emr_client, self.ec2_client = _get_clients()
+        self.ec2_batcher = EC2DescribeInstancesBatcher(
+            self.ec2_client,
+            max_delay=config.EC2_DESCRIBE_BATCH_DELAY_SECONDS,
+            max_batch_size=config.EC2_DESCRIBE_BATCH_MAX_IDS,
+            chunk_size=config.EC2_DESCRIBE_BATCH_SIZE,
+            max_workers=config.EC2_DESCRIBE_MAX_WORKERS
+        )
+
+        # describe_cluster responses keyed by cluster_id
+        self._cluster_cache = TTLCache(
+            maxsize=config.CLUSTER_CACHE_MAX_ENTRIES,
+            ttl=config.CLUSTER_METADATA_CACHE_TTL_SECONDS
+        )
+        # Instance groups / fleets keyed by (cluster_id, kind, include_terminated, include_instance_ids),
+        # and describe_cluster's Status keyed by (cluster_id, 'status'); these carry running counts
+        # and state, so they expire sooner
+        self._instance_cache = TTLCache(
+            maxsize=config.CLUSTER_CACHE_MAX_ENTRIES,
+            ttl=config.CLUSTER_STATE_CACHE_TTL_SECONDS
+        )
 
     def list_running_clusters(self) -> List[Dict]:
         """List all running EMR clusters with classification"""
-        clusters = []
-        paginator = self.emr_client.get_paginator('list_clusters')
-
-        for page in paginator.paginate(ClusterStates=['RUNNING', 'WAITING']):
-            for cluster in page['Clusters']:
-                cluster_info = self._get_cluster_details(cluster['Id'])
-                if cluster_info:
-                    clusters.append(cluster_info)
+        cluster_summaries = [
+            cluster
+            for page in self._iter_pages(self.emr_client.list_clusters, ClusterStates=['RUNNING', 'WAITING'])
+            for cluster in page['Clusters']
+        ]
+
+        # Describe clusters concurrently; each lookup is several blocking API calls.
+        # The listing's status is always fresh, so it overrides any cached description.
+        # Runtimes are measured against one shared timestamp for the whole listing.
+        now = datetime.now(timezone.utc)
+        cluster_infos = self._map_concurrently(
+            lambda cluster: self._get_cluster_details(cluster['Id'], status=cluster['Status'], now=now),
+            cluster_summaries
+        )
+        return [cluster_info for cluster_info in cluster_infos if cluster_info]
+
+    @staticmethod
+    def _iter_pages(list_operation, **kwargs) -> Iterator[Dict]:
+        """
+        Yield every page of a Marker-paginated EMR list operation.
+        A plain Marker loop skips the botocore paginator machinery. EMR's list APIs
+        take no MaxResults/PageSize: the page size (50) is fixed server-side.
+        """
+        while True:
+            page = list_operation(**kwargs)
+            yield page
+            marker = page.get('Marker')
+            if not marker:
+                return
+            kwargs['Marker'] = marker
+
+    def _map_concurrently(self, func, items: List) -> List:
+        """Apply func to each item on a bounded thread pool, preserving order"""
+        if not items:
+            return []
 
-        return clusters
+        max_workers = min(config.EMR_FETCH_CONCURRENCY, len(items))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, items))
 
     def list_recently_terminated_clusters(self, hours: int = 3) -> List[Dict]:
         """
@@ -44,12 +251,16 @@ class EMRService:
         """
         from datetime import timedelta
 
-        clusters = []
+        recent_clusters = []
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
 
-        paginator = self.emr_client.get_paginator('list_clusters')
+        # Optionally let EMR drop history created long before the window; only clusters that
+        # ran longer than TERMINATED_CLUSTER_MAX_RUNTIME_DAYS could still have ended inside it
+        list_kwargs = {'ClusterStates': ['TERMINATED', 'TERMINATED_WITH_ERRORS']}
+        if config.TERMINATED_CLUSTER_MAX_RUNTIME_DAYS is not None:
+            list_kwargs['CreatedAfter'] = cutoff_time - timedelta(days=config.TERMINATED_CLUSTER_MAX_RUNTIME_DAYS)
 
-        for page in paginator.paginate(ClusterStates=['TERMINATED', 'TERMINATED_WITH_ERRORS']):
+        for page in self._iter_pages(self.emr_client.list_clusters, **list_kwargs):
             for cluster in page['Clusters']:
                 # Check if terminated within the time window
                 end_time = cluster.get('Status', {}).get('Timeline', {}).get('EndDateTime')
@@ -57,33 +268,118 @@ class EMRService:
                     if end_time.tzinfo is None:
                         end_time = end_time.replace(tzinfo=timezone.utc)
                     if end_time >= cutoff_time:
-                        cluster_info = self._get_cluster_details(cluster['Id'], include_terminated=True)
-                        if cluster_info:
-                            clusters.append(cluster_info)
+                        recent_clusters.append(cluster)
+
+        # Describe the recent ones concurrently, as for running clusters. The listing
+        # only shows group counts and fleet type breakdowns; per-instance IDs are
+        # fetched when a cluster is analyzed (get_cluster_by_id)
+        cluster_infos = self._map_concurrently(
+            lambda cluster: self._get_cluster_details(
+                cluster['Id'], include_terminated=True, status=cluster['Status'],
+                include_instance_ids=False
+            ),
+            recent_clusters
+        )
+        return [cluster_info for cluster_info in cluster_infos if cluster_info]
+
+    def invalidate(self, cluster_id: str):
+        """Drop cached details for a cluster so the next lookup hits the EMR API"""
+        self._cluster_cache.invalidate(lambda key: key == cluster_id)
+        self._instance_cache.invalidate(lambda key: key[0] == cluster_id)
+
+    def _describe_cluster(self, cluster_id: str, with_status: bool = True) -> Dict:
+        """
+        describe_cluster, served from cache while the metadata is fresh.
+        The cluster's Status only counts as fresh for the state TTL, so when the
+        caller relies on it (with_status) an expired status means a new describe.
+        """
+        cluster = self._cluster_cache.get(cluster_id)
+        if cluster is not None and with_status and self._instance_cache.get((cluster_id, 'status')) is None:
+            cluster = None
+        if cluster is None:
+            cluster = self.emr_client.describe_cluster(ClusterId=cluster_id)['Cluster']
+            is_terminated = cluster['Status']['State'] in ['TERMINATED', 'TERMINATED_WITH_ERRORS']
+            self._cluster_cache.set(cluster_id, cluster, ttl=self._cache_ttl(
+                is_terminated, config.CLUSTER_METADATA_CACHE_TTL_SECONDS
+            ))
+            self._instance_cache.set((cluster_id, 'status'), cluster['Status'], ttl=self._cache_ttl(
+                is_terminated, config.CLUSTER_STATE_CACHE_TTL_SECONDS
+            ))
+        return cluster
+
+    @staticmethod
+    def _cache_ttl(is_terminated: bool, default_ttl: float) -> float:
+        """Terminated clusters are immutable, so their entries can live much longer"""
+        return config.CLUSTER_TERMINATED_CACHE_TTL_SECONDS if is_terminated else default_ttl
+
+    def _get_cluster_details(self, cluster_id: str, include_terminated: bool = False,
+                             status: Optional[Dict] = None,
+                             now: Optional[datetime] = None,
+                             include_instance_ids: bool = True) -> Optional[Dict]:
+        """
+        Get detailed information about a cluster.
+        status, when given (e.g. from list_clusters), takes precedence over the
+        possibly cached describe_cluster status. now is the reference time for
+        running clusters' runtime (defaults to the current time).
+        include_instance_ids=False leaves each group's ec2_instances empty, for
+        callers that don't need per-instance metrics.
+
+        Concurrent lookups of the same cluster (e.g. several dashboard tabs
+        refreshing) share one in-flight describe-and-list chain.
+        """
+        key = (cluster_id, include_instance_ids)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = _inflight[key] = concurrent.futures.Future()
 
-        return clusters
+        if not is_leader:
+            return future.result()
 
-    def _get_cluster_details(self, cluster_id: str, include_terminated: bool = False) -> Optional[Dict]:
-        """Get detailed information about a cluster"""
         try:
-            response = self.emr_client.describe_cluster(ClusterId=cluster_id)
-            cluster = response['Cluster']
+            result = self._fetch_cluster_details(cluster_id, include_terminated, status, now, include_instance_ids)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+        future.set_result(result)
+        return result
+
+    def _fetch_cluster_details(self, cluster_id: str, include_terminated: bool, status: Optional[Dict],
+                               now: Optional[datetime], include_instance_ids: bool) -> Optional[Dict]:
+        """Build the cluster details for _get_cluster_details; returns None on failure"""
+        try:
+            cluster = self._describe_cluster(cluster_id, with_status=status is None)
+            status = status or cluster['Status']
 
             # Get timeline info
-            timeline = cluster['Status']['Timeline']
+            timeline = status['Timeline']
             created_time = timeline.get('CreationDateTime')
             end_time = timeline.get('EndDateTime')
-            cluster_state = cluster['Status']['State']
+            cluster_state = status['State']
 
             # Calculate runtime
             is_terminated = cluster_state in ['TERMINATED', 'TERMINATED_WITH_ERRORS']
             if is_terminated and end_time:
-                runtime_hours = self._calculate_runtime_hours_for_terminated(created_time, end_time)
+                runtime_hours = self._runtime_hours(created_time, end_time)
             else:
-                runtime_hours = self._calculate_runtime_hours(created_time)
-
-            # Classify cluster
-            cluster_type = self._classify_cluster(cluster['Name'], runtime_hours)
+                runtime_hours = self._runtime_hours(created_time, now)
+
+            # Classify cluster as TRANSIENT or LONG_RUNNING:
+            # 1. If name matches pattern STRESS-XXXXXX-{S,L,XL} -> TRANSIENT
+            #    (the literal prefix rules out most names without the regex)
+            # 2. If runtime > LONG_RUNNING_THRESHOLD_HOURS -> LONG_RUNNING
+            # 3. Default to TRANSIENT for shorter-running clusters
+            cluster_name = cluster['Name']
+            if cluster_name.startswith(config.TRANSIENT_CLUSTER_PREFIX) and _TRANSIENT_RE.match(cluster_name):
+                cluster_type = 'TRANSIENT'
+            elif runtime_hours > config.LONG_RUNNING_THRESHOLD_HOURS:
+                cluster_type = 'LONG_RUNNING'
+            else:
+                cluster_type = 'TRANSIENT'
 
             # Determine if cluster uses Instance Fleets or Instance Groups
             instance_collection_type = cluster.get('InstanceCollectionType', 'INSTANCE_GROUP')
@@ -91,15 +387,19 @@ class EMRService:
             # Get instances based on collection type
             # For terminated clusters, we still get the configuration but won't have running EC2 instances
             if instance_collection_type == 'INSTANCE_FLEET':
-                instance_groups = self._get_instance_fleets(cluster_id, include_terminated=is_terminated)
+                instance_groups = self._get_instance_fleets(
+                    cluster_id, include_terminated=is_terminated, include_instance_ids=include_instance_ids
+                )
                 uses_fleets = True
             else:
-                instance_groups = self._get_instance_groups(cluster_id, include_terminated=is_terminated)
+                instance_groups = self._get_instance_groups(
+                    cluster_id, include_terminated=is_terminated, include_instance_ids=include_instance_ids
+                )
                 uses_fleets = False
 
             result = {
                 'id': cluster_id,
-                'name': cluster['Name'],
+                'name': cluster_name,
                 'state': cluster_state,
                 'created_time': created_time.isoformat() if created_time else None,
                 'end_time': end_time.isoformat() if end_time else None,
@@ -110,119 +410,117 @@ class EMRService:
                 'instance_groups': instance_groups,
                 'normalized_instance_hours': cluster.get('NormalizedInstanceHours', 0),
                 'release_label': cluster.get('ReleaseLabel', 'Unknown'),
-                'applications': [app['Name'] for app in cluster.get('Applications', [])],
-                'tags': {tag['Key']: tag['Value'] for tag in cluster.get('Tags', [])},
+                'applications': list(map(_APP_NAME, cluster.get('Applications') or ())),
+                'tags': dict(map(_TAG_ITEM, cluster.get('Tags') or ())),
                 'is_terminated': is_terminated
             }
 
             # Add termination reason for terminated clusters
             if is_terminated:
-                state_change_reason = cluster['Status'].get('StateChangeReason', {})
+                state_change_reason = status.get('StateChangeReason', {})
                 result['termination_reason'] = {
                     'code': state_change_reason.get('Code', 'UNKNOWN'),
                     'message': state_change_reason.get('Message', '')
                 }
 
             return result
-        except Exception as e:
-            print(f"Error getting cluster details for {cluster_id}: {e}")
+        except Exception:
+            logger.exception("Error getting cluster details for %s", cluster_id)
             return None
 
-    def _calculate_runtime_hours_for_terminated(self, created_time: datetime, end_time: datetime) -> float:
-        """Calculate runtime for a terminated cluster"""
-        if not created_time or not end_time:
-            return 0
-
-        if created_time.tzinfo is None:
-            created_time = created_time.replace(tzinfo=timezone.utc)
-        if end_time.tzinfo is None:
-            end_time = end_time.replace(tzinfo=timezone.utc)
-
-        delta = end_time - created_time
-        return round(delta.total_seconds() / 3600, 2)
-
-    def _calculate_runtime_hours(self, created_time: datetime) -> float:
-        """Calculate how long the cluster has been running"""
-        if not created_time:
-            return 0
-
-        now = datetime.now(timezone.utc)
-        if created_time.tzinfo is None:
-            created_time = created_time.replace(tzinfo=timezone.utc)
-
-        delta = now - created_time
-        return round(delta.total_seconds() / 3600, 2)
-
-    def _classify_cluster(self, cluster_name: str, runtime_hours: float) -> str:
+    @staticmethod
+    def _runtime_hours(start_time: Optional[datetime], end_time: Optional[datetime] = None) -> float:
         """
-        Classify cluster as TRANSIENT or LONG_RUNNING
-
-        Rules:
-        1. If name matches pattern STRESS-XXXXXX-{S,L,XL} -> TRANSIENT
-        2. If runtime > LONG_RUNNING_THRESHOLD_HOURS -> LONG_RUNNING
-        3. Default to TRANSIENT for shorter-running clusters
+        Hours from start_time to end_time (defaults to the current time).
+        botocore parses EMR timeline timestamps as tz-aware UTC datetimes, so no
+        tzinfo normalization is needed here.
         """
-        # Check name pattern first
-        if self.transient_pattern.match(cluster_name):
-            return 'TRANSIENT'
-
-        # Check runtime
-        if runtime_hours > config.LONG_RUNNING_THRESHOLD_HOURS:
-            return 'LONG_RUNNING'
+        if not start_time:
+            return 0
 
-        # Default to transient for shorter-running clusters
-        return 'TRANSIENT'
+        if end_time is None:
+            end_time = datetime.now(timezone.utc)
+        return round((end_time - start_time).total_seconds() / 3600, 2)
 
-    def _get_instance_groups(self, cluster_id: str, include_terminated: bool = False) -> List[Dict]:
+    def _get_instance_groups(self, cluster_id: str, include_terminated: bool = False,
+                             include_instance_ids: bool = True) -> List[Dict]:
         """Get instance groups for a cluster (traditional configuration)"""
+        instance_groups = self._get_cached_instances(cluster_id, 'groups', include_terminated, include_instance_ids)
+        if instance_groups is not None:
+            return instance_groups
+        cache_key = (cluster_id, 'groups', include_terminated, include_instance_ids)
+
         instance_groups = []
 
         try:
-            response = self.emr_client.list_instance_groups(ClusterId=cluster_id)
-
-            for group in response['InstanceGroups']:
-                # Get EC2 instance IDs for this group
-                # For terminated clusters, get historical instances
-                if include_terminated:
-                    ec2_instances = self._get_historical_ec2_instances_for_group(cluster_id, group['Id'])
-                else:
-                    ec2_instances = self._get_ec2_instances_for_group(cluster_id, group['Id'])
+            # Get EC2 instance IDs for all groups in one pass; that listing doesn't
+            # depend on the group listing, so both requests are in flight at once.
+            # Without instance IDs nothing else is needed from it, so it is skipped.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                instances_future = None
+                if include_instance_ids:
+                    instances_future = executor.submit(self._list_all_instances, cluster_id, include_terminated)
+                groups = [
+                    group
+                    for page in self._iter_pages(self.emr_client.list_instance_groups, ClusterId=cluster_id)
+                    for group in page['InstanceGroups']
+                ]
+                ec2_instances_by_group, _, instances_listed = (
+                    instances_future.result() if instances_future else ({}, None, True)
+                )
 
+            for group in groups:
+                group_id, group_type, instance_type = _GROUP_FIELDS(group)
                 instance_groups.append({
-                    'id': group['Id'],
-                    'name': group.get('Name', group['InstanceGroupType']),
-                    'type': group['InstanceGroupType'],  # MASTER, CORE, TASK
-                    'instance_type': group['InstanceType'],
+                    'id': group_id,
+                    'name': group.get('Name', group_type),
+                    'type': group_type,  # MASTER, CORE, TASK
+                    'instance_type': instance_type,
                     'requested_count': group.get('RequestedInstanceCount', 0),
                     'running_count': group.get('RunningInstanceCount', 0),
                     'market': group.get('Market', 'ON_DEMAND'),
                     'state': group['Status']['State'],
-                    'ec2_instances': ec2_instances,
+                    'ec2_instances': ec2_instances_by_group.get(group_id, []),
                     'is_fleet': False
                 })
-        except Exception as e:
-            print(f"Error getting instance groups for {cluster_id}: {e}")
+            # A failed instance listing leaves the groups without instances; don't keep that
+            if instances_listed:
+                self._instance_cache.set(cache_key, instance_groups, ttl=self._cache_ttl(
+                    include_terminated, config.CLUSTER_STATE_CACHE_TTL_SECONDS
+                ))
+        except Exception:
+            logger.exception("Error getting instance groups for %s", cluster_id)
 
         return instance_groups
 
-    def _get_instance_fleets(self, cluster_id: str, include_terminated: bool = False) -> List[Dict]:
+    def _get_instance_fleets(self, cluster_id: str, include_terminated: bool = False,
+                             include_instance_ids: bool = True) -> List[Dict]:
         """Get instance fleets for a cluster (fleet configuration)"""
+        instance_fleets = self._get_cached_instances(cluster_id, 'fleets', include_terminated, include_instance_ids)
+        if instance_fleets is not None:
+            return instance_fleets
+        cache_key = (cluster_id, 'fleets', include_terminated, include_instance_ids)
+
         instance_fleets = []
 
         try:
-            response = self.emr_client.list_instance_fleets(ClusterId=cluster_id)
-
-            for fleet in response['InstanceFleets']:
-                # Get EC2 instance IDs for this fleet
-                # For terminated clusters, get historical instances
-                if include_terminated:
-                    ec2_instances, instance_type_counts = self._get_historical_ec2_instances_for_fleet(
-                        cluster_id, fleet['Id']
-                    )
-                else:
-                    ec2_instances, instance_type_counts = self._get_ec2_instances_for_fleet(
-                        cluster_id, fleet['Id']
-                    )
+            # Get EC2 instance IDs and type counts for all fleets in one pass,
+            # overlapped with the fleet listing as for instance groups
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                instances_future = executor.submit(
+                    self._list_all_instances, cluster_id, include_terminated, include_instance_ids
+                )
+                fleets = [
+                    fleet
+                    for page in self._iter_pages(self.emr_client.list_instance_fleets, ClusterId=cluster_id)
+                    for fleet in page['InstanceFleets']
+                ]
+                ec2_instances_by_fleet, type_counts_by_fleet, instances_listed = instances_future.result()
+
+            for fleet in fleets:
+                fleet_id = fleet['Id']
+                ec2_instances = ec2_instances_by_fleet.get(fleet_id, [])
+                instance_type_counts = type_counts_by_fleet.get(fleet_id, Counter())
 
                 # Determine the primary instance type (most common in the fleet)
                 primary_instance_type = self._get_primary_instance_type(
@@ -239,135 +537,97 @@ class EMRService:
                         'bid_price_as_percentage': spec.get('BidPriceAsPercentageOfOnDemandPrice')
                     })
 
+                # Read each capacity field once; several outputs are derived from them
+                fleet_type = fleet['InstanceFleetType']
+                target_on_demand = fleet.get('TargetOnDemandCapacity', 0)
+                target_spot = fleet.get('TargetSpotCapacity', 0)
+                provisioned_on_demand = fleet.get('ProvisionedOnDemandCapacity', 0)
+                provisioned_spot = fleet.get('ProvisionedSpotCapacity', 0)
+
                 instance_fleets.append({
-                    'id': fleet['Id'],
-                    'name': fleet.get('Name', fleet['InstanceFleetType']),
-                    'type': fleet['InstanceFleetType'],  # MASTER, CORE, TASK
+                    'id': fleet_id,
+                    'name': fleet.get('Name', fleet_type),
+                    'type': fleet_type,  # MASTER, CORE, TASK
                     'instance_type': primary_instance_type,  # Primary/most common type
                     'instance_type_specs': instance_type_specs,  # All configured types
-                    'requested_count': fleet.get('TargetOnDemandCapacity', 0) + fleet.get('TargetSpotCapacity', 0),
-                    'running_count': fleet.get('ProvisionedOnDemandCapacity', 0) + fleet.get('ProvisionedSpotCapacity', 0),
-                    'target_on_demand': fleet.get('TargetOnDemandCapacity', 0),
-                    'target_spot': fleet.get('TargetSpotCapacity', 0),
-                    'provisioned_on_demand': fleet.get('ProvisionedOnDemandCapacity', 0),
-                    'provisioned_spot': fleet.get('ProvisionedSpotCapacity', 0),
-                    'market': 'MIXED' if fleet.get('TargetSpotCapacity', 0) > 0 else 'ON_DEMAND',
+                    'requested_count': target_on_demand + target_spot,
+                    'running_count': provisioned_on_demand + provisioned_spot,
+                    'target_on_demand': target_on_demand,
+                    'target_spot': target_spot,
+                    'provisioned_on_demand': provisioned_on_demand,
+                    'provisioned_spot': provisioned_spot,
+                    'market': 'MIXED' if target_spot > 0 else 'ON_DEMAND',
                     'state': fleet['Status']['State'],
                     'ec2_instances': ec2_instances,
                     'instance_type_counts': instance_type_counts,  # Count per instance type
                     'is_fleet': True
                 })
-        except Exception as e:
-            print(f"Error getting instance fleets for {cluster_id}: {e}")
+            if instances_listed:
+                self._instance_cache.set(cache_key, instance_fleets, ttl=self._cache_ttl(
+                    include_terminated, config.CLUSTER_STATE_CACHE_TTL_SECONDS
+                ))
+        except Exception:
+            logger.exception("Error getting instance fleets for %s", cluster_id)
 
         return instance_fleets
 
-    def _get_ec2_instances_for_group(self, cluster_id: str, instance_group_id: str) -> List[str]:
-        """Get EC2 instance IDs for an instance group"""
-        ec2_instances = []
-
-        try:
-            paginator = self.emr_client.get_paginator('list_instances')
-            for page in paginator.paginate(
-                ClusterId=cluster_id,
-                InstanceGroupId=instance_group_id,
-                InstanceStates=['RUNNING']
-            ):
-                for instance in page['Instances']:
-                    if 'Ec2InstanceId' in instance:
-                        ec2_instances.append(instance['Ec2InstanceId'])
-        except Exception as e:
-            print(f"Error getting EC2 instances for group {instance_group_id}: {e}")
-
-        return ec2_instances
-
-    def _get_historical_ec2_instances_for_group(self, cluster_id: str, instance_group_id: str) -> List[str]:
+    def _get_cached_instances(self, cluster_id: str, kind: str, include_terminated: bool,
+                              include_instance_ids: bool) -> Optional[List[Dict]]:
+        """Cached groups / fleets; an entry with instance IDs also serves a request without them"""
+        for with_ids in ((True,) if include_instance_ids else (False, True)):
+            cached = self._instance_cache.get((cluster_id, kind, include_terminated, with_ids))
+            if cached is not None:
+                return cached
+        return None
+
+    def _list_all_instances(self, cluster_id: str, include_terminated: bool = False,
+                            include_instance_ids: bool = True) -> tuple:
         """
-        Get EC2 instance IDs for a terminated cluster's instance group.
-        Includes terminated instances for historical analysis.
+        Get EC2 instance IDs for every instance group / fleet of a cluster with a
+        single paginated list_instances call.
+        For terminated clusters, includes terminated instances for historical analysis.
+        With include_instance_ids=False only the type counts are accumulated.
+        Returns tuple of (dict of group/fleet ID -> list of instance IDs,
+                          dict of group/fleet ID -> Counter of instance types,
+                          whether the listing completed; on errors the maps may be partial)
         """
-        ec2_instances = []
+        ec2_instances = defaultdict(list)
+        instance_type_counts = defaultdict(Counter)
+        instance_states = ['RUNNING', 'TERMINATED'] if include_terminated else ['RUNNING']
 
         try:
-            paginator = self.emr_client.get_paginator('list_instances')
-            # Include TERMINATED state to get historical instances
-            for page in paginator.paginate(
-                ClusterId=cluster_id,
-                InstanceGroupId=instance_group_id,
-                InstanceStates=['RUNNING', 'TERMINATED']
-            ):
-                for instance in page['Instances']:
-                    if 'Ec2InstanceId' in instance:
-                        ec2_instances.append(instance['Ec2InstanceId'])
-        except Exception as e:
-            print(f"Error getting historical EC2 instances for group {instance_group_id}: {e}")
+            for group_id, ec2_instance_id, instance_type in self._iter_instances(cluster_id, instance_states):
+                if include_instance_ids:
+                    ec2_instances[group_id].append(ec2_instance_id)
+                instance_type_counts[group_id][instance_type] += 1
+        except Exception:
+            logger.exception("Error getting EC2 instances for cluster %s", cluster_id)
+            return ec2_instances, instance_type_counts, False
 
-        return ec2_instances
+        return ec2_instances, instance_type_counts, True
 
-    def _get_ec2_instances_for_fleet(self, cluster_id: str, fleet_id: str) -> tuple:
+    def _iter_instances(self, cluster_id: str, instance_states: List[str]):
         """
-        Get EC2 instance IDs for an instance fleet.
-        Returns tuple of (list of instance IDs, dict of instance type counts)
+        Stream (group/fleet ID, EC2 instance ID, instance type) for a cluster's
+        instances across list_instances pages, one page in memory at a time.
         """
-        ec2_instances = []
-        instance_type_counts = {}
-
-        try:
-            paginator = self.emr_client.get_paginator('list_instances')
-            for page in paginator.paginate(
-                ClusterId=cluster_id,
-                InstanceFleetId=fleet_id,
-                InstanceStates=['RUNNING']
-            ):
-                for instance in page['Instances']:
-                    if 'Ec2InstanceId' in instance:
-                        ec2_instances.append(instance['Ec2InstanceId'])
-
-                        # Track instance type counts
-                        inst_type = instance.get('InstanceType', 'unknown')
-                        instance_type_counts[inst_type] = instance_type_counts.get(inst_type, 0) + 1
-        except Exception as e:
-            print(f"Error getting EC2 instances for fleet {fleet_id}: {e}")
-
-        return ec2_instances, instance_type_counts
-
-    def _get_historical_ec2_instances_for_fleet(self, cluster_id: str, fleet_id: str) -> tuple:
-        """
-        Get EC2 instance IDs for a terminated cluster's instance fleet.
-        Includes terminated instances for historical analysis.
-        Returns tuple of (list of instance IDs, dict of instance type counts)
-        """
-        ec2_instances = []
-        instance_type_counts = {}
-
-        try:
-            paginator = self.emr_client.get_paginator('list_instances')
-            # Include TERMINATED state to get historical instances
-            for page in paginator.paginate(
-                ClusterId=cluster_id,
-                InstanceFleetId=fleet_id,
-                InstanceStates=['RUNNING', 'TERMINATED']
-            ):
-                for instance in page['Instances']:
-                    if 'Ec2InstanceId' in instance:
-                        ec2_instances.append(instance['Ec2InstanceId'])
-
-                        # Track instance type counts
-                        inst_type = instance.get('InstanceType', 'unknown')
-                        instance_type_counts[inst_type] = instance_type_counts.get(inst_type, 0) + 1
-        except Exception as e:
-            print(f"Error getting historical EC2 instances for fleet {fleet_id}: {e}")
-
-        return ec2_instances, instance_type_counts
-
-    def _get_primary_instance_type(self, fleet: Dict, instance_type_counts: Dict) -> str:
+        for page in self._iter_pages(
+            self.emr_client.list_instances, ClusterId=cluster_id, InstanceStates=instance_states
+        ):
+            for instance in page['Instances']:
+                if 'Ec2InstanceId' in instance:
+                    # Each instance belongs to either an instance group or an instance fleet
+                    group_id = instance.get('InstanceGroupId') or instance.get('InstanceFleetId')
+                    yield group_id, instance['Ec2InstanceId'], instance.get('InstanceType', 'unknown')
+
+    def _get_primary_instance_type(self, fleet: Dict, instance_type_counts: Counter) -> str:
         """
         Determine the primary instance type for a fleet.
         Uses the most common running instance type, or first configured type.
         """
         # If we have running instances, use the most common type
         if instance_type_counts:
-            return max(instance_type_counts, key=instance_type_counts.get)
+            return instance_type_counts.most_common(1)[0][0]
 
         # Otherwise, use the first instance type from specifications
         specs = fleet.get('InstanceTypeSpecifications', [])
@@ -386,24 +646,43 @@ class EMRService:
         """Get a specific cluster by ID"""
         return self._get_cluster_details(cluster_id)
 
-    def get_instance_group_ec2_details(self, ec2_instance_ids: List[str]) -> List[Dict]:
-        """Get EC2 instance details for monitoring"""
-        if not ec2_instance_ids:
-            return []
+    def iter_cluster_ec2_ids(self, cluster_id: str) -> Iterator[str]:
+        """Yield the EC2 instance IDs of all of a cluster's groups / fleets without merging their lists"""
+        cluster = self._get_cluster_details(cluster_id)
+        if not cluster:
+            return iter(())
+        return chain.from_iterable(group['ec2_instances'] for group in cluster['instance_groups'])
 
+    def get_instance_group_ec2_details(self, ec2_instance_ids: Iterable[str]) -> List[Dict]:
+        """Get EC2 instance details for monitoring; accepts any iterable of instance IDs"""
         ec2_details = []
         try:
-            response = self.ec2_client.describe_instances(InstanceIds=ec2_instance_ids)
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    ec2_details.append({
-                        'instance_id': instance['InstanceId'],
-                        'instance_type': instance['InstanceType'],
-                        'launch_time': instance['LaunchTime'].isoformat(),
-                        'private_ip': instance.get('PrivateIpAddress'),
-                        'state': instance['State']['Name']
-                    })
-        except Exception as e:
-            print(f"Error getting EC2 details: {e}")
+            for ec2_detail in self.iter_instance_group_ec2_details(ec2_instance_ids):
+                ec2_details.append(ec2_detail)
+        except Exception:
+            logger.exception("Error getting EC2 details")
 
         return ec2_details
+
+    def iter_instance_group_ec2_details(self, ec2_instance_ids: Iterable[str]) -> Iterator[Dict]:
+        """
+        Yield EC2 instance details chunk by chunk as DescribeInstances results arrive,
+        so consumers can process them without holding every instance at once.
+        """
+        ec2_instance_ids = iter(ec2_instance_ids)
+
+        # Stream IDs in API-sized chunks; all chunks are in flight at once, and
+        # concurrent callers share DescribeInstances calls through the batcher
+        futures = [
+            self.ec2_batcher.submit(chunk)
+            for chunk in iter(lambda: list(islice(ec2_instance_ids, DESCRIBE_INSTANCES_MAX_IDS)), [])
+        ]
+        for future in futures:
+            for instance in future.result():
+                yield {
+                    'instance_id': instance['InstanceId'],
+                    'instance_type': instance['InstanceType'],
+                    'launch_time': instance['LaunchTime'].isoformat(),
+                    'private_ip': instance.get('PrivateIpAddress'),
+                    'state': instance['State']['Name']
+                }